@@ -7,12 +7,22 @@ Created by wizard1
 import sys
 import os
 import json
+import re
 import ctypes
 import psutil
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+from tkinter import font as tkfont
 import threading
+import concurrent.futures
 import time
+import functools
+import math
+import warnings
+
+# psutil < 6.0 re-checks every PID for reuse in process_iter(), an extra create_time() query each
+if psutil.version_info < (6, 0):
+    warnings.warn(f"psutil {psutil.__version__} is older than 6.0; process scans will be slower")
 
 # Debug timing
 DEBUG_TIMING = True
@@ -34,17 +44,42 @@ KNOWN_PATTERNS = {
     'OBS': ['obs64', 'obs32', 'obs-browser']
 }
 
-SKIP_ALWAYS = {
+SKIP_ALWAYS = frozenset({
     'system', 'system idle process', 'idle', 'registry', 'memcompression', 'memory compression',
     'smss.exe', 'csrss.exe', 'wininit.exe', 'services.exe', 'lsass.exe', 'winlogon.exe',
     'dwm.exe', 'fontdrvhost.exe', 'sihost.exe', 'startmenuexperiencehost.exe',
     'shellexperiencehost.exe', 'searchui.exe', 'searchapp.exe', 'runtimebroker.exe',
     'ctfmon.exe', 'audiodg.exe', 'mc-fw-host.exe', 'affinity_manager.exe'
-}
+})
+
+# All categories in one anchored regex: each branch looks ahead for any of its
+# patterns, and branches are tried in KNOWN_PATTERNS order so the first category
+# still wins; the empty named group of the taken branch identifies it
+PATTERN_CATEGORIES = {f'c{i}': category for i, category in enumerate(KNOWN_PATTERNS)}
+PATTERN_MATCHER = re.compile('|'.join(
+    f"(?=.*?(?:{'|'.join(re.escape(p.lower()) for p in patterns)}))(?P<c{i}>)"
+    for i, patterns in enumerate(KNOWN_PATTERNS.values())
+), re.DOTALL)
+
+# Owner of this process, lowercased; looked up once since it cannot change
+try:
+    _CURRENT_USER = (psutil.Process(os.getpid()).username() or '').lower()
+except Exception:
+    _CURRENT_USER = ''
 
 # Thresholds for warnings
 MAX_THREADS_PER_CORE = 300  # Warn if threads/core exceeds this
 
+# Window over which the first scan samples CPU usage to find the top CPU process
+CPU_SAMPLE_SECONDS = 0.1
+
+# A Refresh within this many seconds of the last completed scan reuses it
+SCAN_REUSE_SECONDS = 0.5
+
+# Affinity writes for groups at least this large go through a thread pool
+AFFINITY_POOL_MIN = 8
+AFFINITY_POOL_WORKERS = 16
+
 # Colors - Dark theme palette
 BG_MAIN = "#1e1e1e"           # Main background
 BG_FRAME = "#252526"          # Frame background
@@ -63,18 +98,171 @@ BTN_FG = "#ffffff"            # Button foreground
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# Win32 entry points, resolved once with explicit signatures for 64-bit safety
+if sys.platform == 'win32':
+    from ctypes import wintypes
+    
+    _IsUserAnAdmin = ctypes.windll.shell32.IsUserAnAdmin
+    _IsUserAnAdmin.argtypes = []
+    _IsUserAnAdmin.restype = wintypes.BOOL
+    
+    _ShellExecuteW = ctypes.windll.shell32.ShellExecuteW
+    _ShellExecuteW.argtypes = [wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR,
+                               wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_int]
+    _ShellExecuteW.restype = wintypes.HINSTANCE
+    
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _OpenProcess = _kernel32.OpenProcess
+    _OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _OpenProcess.restype = wintypes.HANDLE
+    _SetProcessAffinityMask = _kernel32.SetProcessAffinityMask
+    _SetProcessAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+    _SetProcessAffinityMask.restype = wintypes.BOOL
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = [wintypes.HANDLE]
+    _CloseHandle.restype = wintypes.BOOL
+    _GetProcessTimes = _kernel32.GetProcessTimes
+    _GetProcessTimes.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+    _GetProcessTimes.restype = wintypes.BOOL
+    _GetLogicalProcessorInformationEx = _kernel32.GetLogicalProcessorInformationEx
+    _GetLogicalProcessorInformationEx.argtypes = [ctypes.c_int, ctypes.c_void_p,
+                                                  ctypes.POINTER(wintypes.DWORD)]
+    _GetLogicalProcessorInformationEx.restype = wintypes.BOOL
+    
+    _ntdll = ctypes.WinDLL('ntdll')
+    _NtQuerySystemInformation = _ntdll.NtQuerySystemInformation
+    _NtQuerySystemInformation.argtypes = [ctypes.c_int, ctypes.c_void_p, wintypes.ULONG,
+                                          ctypes.POINTER(wintypes.ULONG)]
+    _NtQuerySystemInformation.restype = ctypes.c_long
+    
+    class _UNICODE_STRING(ctypes.Structure):
+        _fields_ = [('Length', wintypes.USHORT), ('MaximumLength', wintypes.USHORT),
+                    ('Buffer', ctypes.c_void_p)]
+    
+    # Leading fields of SYSTEM_PROCESS_INFORMATION, enough to reach SessionId
+    class _SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+        _fields_ = [('NextEntryOffset', wintypes.ULONG), ('NumberOfThreads', wintypes.ULONG),
+                    ('WorkingSetPrivateSize', ctypes.c_int64), ('HardFaultCount', wintypes.ULONG),
+                    ('NumberOfThreadsHighWatermark', wintypes.ULONG), ('CycleTime', ctypes.c_uint64),
+                    ('CreateTime', ctypes.c_int64), ('UserTime', ctypes.c_int64),
+                    ('KernelTime', ctypes.c_int64), ('ImageName', _UNICODE_STRING),
+                    ('BasePriority', ctypes.c_long), ('UniqueProcessId', ctypes.c_void_p),
+                    ('InheritedFromUniqueProcessId', ctypes.c_void_p),
+                    ('HandleCount', wintypes.ULONG), ('SessionId', wintypes.ULONG)]
+else:
+    _IsUserAnAdmin = None
+    _ShellExecuteW = None
+    _SetProcessAffinityMask = None
+    _GetLogicalProcessorInformationEx = None
+    _NtQuerySystemInformation = None
+
+PROCESS_SET_INFORMATION = 0x0200
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+RELATION_PROCESSOR_CORE = 0
+SYSTEM_PROCESS_INFORMATION_CLASS = 5
+STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+FILETIME_UNIX_EPOCH = 116444736000000000  # 1970-01-01 in 100 ns units since 1601
+
 def is_admin():
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
+        return bool(_IsUserAnAdmin())
     except:
         return False
 
+def read_core_topology():
+    """Read physical cores from GetLogicalProcessorInformationEx (Windows only).
+    
+    Returns a list of (efficiency_class, logical_indices) per physical core, or
+    None if the topology cannot be read. Logical indices number the processors
+    of group 0 first, then group 1, and so on, like psutil.cpu_count().
+    """
+    if _GetLogicalProcessorInformationEx is None:
+        return None
+    size = wintypes.DWORD(0)
+    _GetLogicalProcessorInformationEx(RELATION_PROCESSOR_CORE, None, ctypes.byref(size))
+    if not size.value:
+        return None
+    buf = ctypes.create_string_buffer(size.value)
+    if not _GetLogicalProcessorInformationEx(RELATION_PROCESSOR_CORE, buf, ctypes.byref(size)):
+        return None
+    raw = buf.raw[:size.value]
+    
+    # SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX records are variable length:
+    # Relationship/Size DWORDs, then PROCESSOR_RELATIONSHIP with EfficiencyClass
+    # at +9, GroupCount at +30 and GROUP_AFFINITY entries (KAFFINITY + 4 WORDs) at +32
+    kaffinity = ctypes.sizeof(ctypes.c_size_t)
+    stride = kaffinity + 8
+    records = []
+    offset = 0
+    while offset + 8 <= len(raw):
+        relationship = int.from_bytes(raw[offset:offset + 4], 'little')
+        record_size = int.from_bytes(raw[offset + 4:offset + 8], 'little')
+        if not record_size:
+            break
+        if relationship == RELATION_PROCESSOR_CORE:
+            group_count = int.from_bytes(raw[offset + 30:offset + 32], 'little')
+            groups = []
+            for g in range(group_count):
+                base = offset + 32 + g * stride
+                mask = int.from_bytes(raw[base:base + kaffinity], 'little')
+                group = int.from_bytes(raw[base + kaffinity:base + kaffinity + 2], 'little')
+                groups.append((group, mask))
+            records.append((raw[offset + 9], groups))
+        offset += record_size
+    
+    # Processor groups are numbered consecutively
+    group_sizes = {}
+    for _, groups in records:
+        for group, mask in groups:
+            group_sizes[group] = group_sizes.get(group, 0) + bin(mask).count('1')
+    group_base = {}
+    total = 0
+    for group in sorted(group_sizes):
+        group_base[group] = total
+        total += group_sizes[group]
+    
+    return [
+        (efficiency_class, [group_base[group] + i for group, mask in groups for i in mask_to_cores(mask)])
+        for efficiency_class, groups in records
+    ] or None
+
+@functools.lru_cache(maxsize=1)
 def get_cpu_info():
-    """Get CPU core information with P/E core detection."""
+    """Get CPU core information with P/E core detection (cached, topology is static).
+    
+    Uses the OS-reported topology where available: cores of the highest
+    EfficiencyClass are P-cores, the rest E-cores (all P on non-hybrid CPUs).
+    Falls back to a core count heuristic otherwise.
+    """
     logical = psutil.cpu_count(logical=True)
     physical = psutil.cpu_count(logical=False)
     threads_per_core = max(1, logical // physical) if physical else 1
     
+    try:
+        topology = read_core_topology()
+    except Exception:
+        topology = None
+    if topology and sum(len(indices) for _, indices in topology) == logical:
+        top_class = max(efficiency_class for efficiency_class, _ in topology)
+        core_types = ['E'] * logical
+        p_cores = 0
+        for efficiency_class, indices in topology:
+            if efficiency_class == top_class:
+                p_cores += 1
+                for i in indices:
+                    core_types[i] = 'P'
+        p_count = core_types.count('P')
+        return {
+            'logical': logical,
+            'physical': len(topology),
+            'p_cores': p_cores,
+            'e_cores': len(topology) - p_cores,
+            'p_count': p_count,
+            'e_count': logical - p_count,
+            'core_types': tuple(core_types),
+            'threads_per_core': max(len(indices) for _, indices in topology)
+        }
+    
     if logical > physical:
         ht_threads = logical - physical
         if physical >= 10:
@@ -93,12 +281,8 @@ def get_cpu_info():
         p_count = logical
         e_count = 0
     
-    core_types = []
-    for i in range(logical):
-        if i < p_count:
-            core_types.append('P')
-        else:
-            core_types.append('E')
+    # Heuristic layout: P-core threads first, then E-cores
+    core_types = ('P',) * p_count + ('E',) * (logical - p_count)
     
     return {
         'logical': logical,
@@ -111,189 +295,709 @@ def get_cpu_info():
         'threads_per_core': threads_per_core
     }
 
-def discover_all_processes_single_pass():
-    """Single pass through all processes - discovers known patterns AND top CPU at once."""
-    debug_ts("discover_all_processes_single_pass start")
+def mask_to_cores(mask):
+    """Unpack an int bitmask into a sorted list of logical core indices."""
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+def mask_bounds(mask):
+    """Lowest and highest core index set in a non-zero bitmask."""
+    return (mask & -mask).bit_length() - 1, mask.bit_length() - 1
+
+def format_mask(mask):
+    """Format a core bitmask as compact ranges, e.g. '0-3,8'; '' if unknown/unset."""
+    if not mask:
+        return ''
+    parts = []
+    cores = mask_to_cores(mask)
+    start = prev = cores[0]
+    for c in cores[1:] + [None]:
+        if c is not None and c == prev + 1:
+            prev = c
+            continue
+        parts.append(str(start) if start == prev else f"{start}-{prev}")
+        if c is not None:
+            start = prev = c
+    return ','.join(parts)
+
+def match_category(name_lower):
+    """Return the first KNOWN_PATTERNS category matching a lowercased process name."""
+    m = PATTERN_MATCHER.match(name_lower)
+    return PATTERN_CATEGORIES[m.lastgroup] if m else None
+
+class ProcInfo:
+    """The fields kept for a grouped or Other process.
     
+    The current affinity is not queried: nothing decides on it, and
+    cpu_affinity() is one of the costlier calls. cores_mask is only the mask
+    this app last set (None until then), shown in the Other table, and never
+    stands in for the real affinity. proc is the
+    psutil.Process, or None for entries from the native snapshot; those carry
+    create_time (100 ns units) instead, so a reused PID can be told apart.
+    """
+    __slots__ = ('pid', 'name', 'threads', 'cores_mask', 'cpu_percent', 'proc', 'create_time')
+    
+    def __init__(self, pid, name, threads, proc=None, cpu_percent=None, create_time=None):
+        self.pid = pid
+        self.name = name
+        self.threads = threads
+        self.cores_mask = None
+        self.cpu_percent = cpu_percent
+        self.proc = proc
+        self.create_time = create_time
+
+def get_proc_data(proc):
+    """Read the fields kept for a matched process."""
+    return ProcInfo(proc.pid, proc.info['name'], proc.num_threads(), proc)
+
+def is_other_user(proc):
+    """Check if a process belongs to a different user (unknown owner counts as ours)."""
+    if not _CURRENT_USER:
+        return False
     try:
-        current_user = psutil.Process(os.getpid()).username()
+        username = proc.username()
+    except psutil.AccessDenied:
+        return False
+    return bool(username) and username.lower() != _CURRENT_USER
+
+def read_process_snapshot():
+    """Read the whole process table with one NtQuerySystemInformation call (Windows only).
+    
+    Returns a list of (pid, name, threads, session_id, create_time, cpu_time)
+    tuples, times in 100 ns units, or None if the native call is unavailable.
+    """
+    if _NtQuerySystemInformation is None:
+        return None
+    size = 1 << 20
+    needed = wintypes.ULONG(0)
+    while True:
+        buf = ctypes.create_string_buffer(size)
+        status = _NtQuerySystemInformation(SYSTEM_PROCESS_INFORMATION_CLASS, buf, size, ctypes.byref(needed))
+        status &= 0xFFFFFFFF
+        if status != STATUS_INFO_LENGTH_MISMATCH:
+            break
+        # Processes can start between calls, so leave some headroom
+        size = max(needed.value, size) + (64 << 10)
+    if status:
+        return None
+    
+    snapshot = []
+    offset = 0
+    while True:
+        info = _SYSTEM_PROCESS_INFORMATION.from_buffer(buf, offset)
+        image = info.ImageName
+        name = ctypes.wstring_at(image.Buffer, image.Length // 2) if image.Buffer else ''
+        snapshot.append((info.UniqueProcessId or 0, name, info.NumberOfThreads, info.SessionId,
+                         info.CreateTime, info.UserTime + info.KernelTime))
+        if not info.NextEntryOffset:
+            break
+        offset += info.NextEntryOffset
+    return snapshot
+
+# CPU time per process from the previous scan, for CPU usage deltas: keyed by
+# (pid, create_time) on the native path and by psutil.Process on the psutil path
+_last_cpu_sample = {'at': None, 'times': {}}
+
+# is_other_user() verdicts from the previous scan. A process never changes owner;
+# keys are (pid, create_time) on the native path and psutil.Process (which hashes
+# by pid + create time) on the psutil path, so reused PIDs miss
+_other_user_cache = {}
+
+def scan_process_snapshot(snapshot):
+    """scan_all_processes() over a read_process_snapshot() table.
+    
+    Processes in another session than ours are rejected outright; the rest are
+    checked with is_other_user() once per process, since SYSTEM and service
+    processes can run in our session too. CPU usage is the CPU time used since
+    the previous snapshot.
+    """
+    my_pid = os.getpid()
+    my_session = next((entry[3] for entry in snapshot if entry[0] == my_pid), None)
+    
+    now = time.monotonic()
+    elapsed = now - _last_cpu_sample['at'] if _last_cpu_sample['at'] is not None else 0
+    last_times = _last_cpu_sample['times']
+    times = {}
+    
+    results = {name: [] for name in KNOWN_PATTERNS.keys()}
+    unique_names = {name: {} for name in KNOWN_PATTERNS.keys()}  # dicts as ordered sets
+    top_cpu_candidates = []
+    other_candidates = []
+    owners = {}
+    
+    for pid, name, threads, session_id, create_time, cpu_time in snapshot:
+        times[pid, create_time] = cpu_time
+        name_lower = name.lower()
+        
+        # Cheapest rejects first: empty name, ourselves, critical OS processes
+        if not name_lower or pid == my_pid or name_lower in SKIP_ALWAYS:
+            continue
+        
+        proc_data = ProcInfo(pid, name, threads, create_time=create_time)
+        category = match_category(name_lower)
+        if category is not None:
+            results[category].append(proc_data)
+            unique_names[category][name] = None
+            continue
+        
+        if my_session is not None and session_id != my_session:
+            continue
+        other_user = _other_user_cache.get((pid, create_time))
+        if other_user is None:
+            try:
+                other_user = is_other_user(psutil.Process(pid))
+            except psutil.NoSuchProcess:
+                continue
+            except psutil.AccessDenied:
+                other_user = False  # Unknown owner counts as ours, as in is_other_user()
+        owners[pid, create_time] = other_user
+        if other_user:
+            continue
+        other_candidates.append(proc_data)
+        
+        previous = last_times.get((pid, create_time))
+        if previous is not None and elapsed > 0:
+            cpu_percent = (cpu_time - previous) / 1e5 / elapsed  # 100 ns units -> percent
+            if cpu_percent > 0.5:
+                top_cpu_candidates.append((cpu_percent, proc_data))
+    
+    _last_cpu_sample['at'] = now
+    _last_cpu_sample['times'] = times
+    
+    # Keep verdicts for live processes only
+    _other_user_cache.clear()
+    _other_user_cache.update(owners)
+    
+    top_cpu = []
+    if top_cpu_candidates:
+        cpu_percent, proc_data = max(top_cpu_candidates, key=lambda x: x[0])
+        proc_data.cpu_percent = cpu_percent
+        top_cpu = [proc_data]
+    
+    return results, top_cpu, other_candidates, {k: list(v) for k, v in unique_names.items()}
+
+def scan_all_processes():
+    """Single pass through all processes - classifies known patterns, top CPU and "Other" candidates at once.
+    
+    Returns (results, top_cpu, other_candidates, unique_names). Known and top CPU
+    entries are ProcInfo objects; other_candidates are user-owned processes,
+    expanded later by find_other_processes(); unique_names maps each category to
+    its distinct process names in scan order.
+    
+    On Windows the table comes from a single native snapshot; psutil is the fallback.
+    """
+    debug_ts("scan_all_processes start")
+    
+    try:
+        snapshot = read_process_snapshot()
     except Exception:
-        current_user = None
+        snapshot = None
+    if snapshot is not None and _last_cpu_sample['at'] is None:
+        # First scan: take a CPU time baseline so the top CPU process shows up right away
+        _last_cpu_sample['at'] = time.monotonic()
+        _last_cpu_sample['times'] = {(entry[0], entry[4]): entry[5] for entry in snapshot}
+        time.sleep(CPU_SAMPLE_SECONDS)
+        snapshot = read_process_snapshot()
+    if snapshot is not None:
+        scan = scan_process_snapshot(snapshot)
+        debug_ts(f"scan_all_processes done (native): {len(snapshot)} processes, other={len(scan[2])}")
+        return scan
     
     my_pid = os.getpid()
     
     # Results by category
     results = {name: [] for name in KNOWN_PATTERNS.keys()}
-    top_cpu_candidates = []
+    unique_names = {name: {} for name in KNOWN_PATTERNS.keys()}  # dicts as ordered sets
+    other_candidates = []
+    owners = {}
     
     debug_ts("starting process iteration")
-    for proc in psutil.process_iter(['pid', 'name', 'cpu_affinity', 'num_threads', 'cpu_percent', 'username']):
+    # Only pid/name are prefetched; everything else is queried for matches only
+    for proc in psutil.process_iter(['pid', 'name']):
         try:
             pid = proc.info['pid']
             name_lower = (proc.info['name'] or '').lower()
             
-            if not name_lower or pid == my_pid:
+            # Cheapest rejects first: empty name, ourselves, critical OS processes
+            if not name_lower or pid == my_pid or name_lower in SKIP_ALWAYS:
                 continue
             
-            proc_data = {
-                'pid': pid,
-                'name': proc.info['name'],
-                'threads': proc.info['num_threads'],
-                'cores': set(proc.cpu_affinity()),
-                'cpu_percent': proc.info.get('cpu_percent', 0) or 0,
-                'proc': proc
-            }
-            
             # Check against known patterns
-            matched = False
-            for category, patterns in KNOWN_PATTERNS.items():
-                if any(p.lower() in name_lower for p in patterns):
-                    results[category].append(proc_data)
-                    matched = True
-                    break
+            category = match_category(name_lower)
+            if category is not None:
+                results[category].append(get_proc_data(proc))
+                unique_names[category][proc.info['name']] = None
+                continue
             
-            # If not matched to known category, consider for top CPU
-            if not matched and name_lower not in SKIP_ALWAYS:
-                if current_user and proc.info.get('username'):
-                    if proc.info['username'].lower() != current_user.lower():
-                        continue
-                
-                if proc_data['cpu_percent'] > 0.5:
-                    top_cpu_candidates.append(proc_data)
+            # Not matched to known category: user-owned processes are "Other" candidates
+            other_user = _other_user_cache.get(proc)
+            if other_user is None:
+                other_user = is_other_user(proc)
+            owners[proc] = other_user
+            if other_user:
+                continue
+            other_candidates.append(proc)
                     
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
     
     debug_ts("process iteration done")
     
-    # Get top CPU process
+    # Keep verdicts for live processes only
+    _other_user_cache.clear()
+    _other_user_cache.update(owners)
+    
+    # Get top CPU process from CPU time used since the last scan, for Other candidates only
+    top_cpu_candidates = [(cpu, proc) for cpu, proc in sample_cpu_percent(other_candidates) if cpu > 0.5]
     top_cpu = []
-    if top_cpu_candidates:
-        top_cpu = sorted(top_cpu_candidates, key=lambda x: x['cpu_percent'], reverse=True)[:1]
+    for cpu_percent, proc in sorted(top_cpu_candidates, key=lambda x: x[0], reverse=True):
+        try:
+            proc_data = get_proc_data(proc)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        proc_data.cpu_percent = cpu_percent
+        top_cpu = [proc_data]
+        break
     
-    debug_ts(f"discover_all_processes_single_pass done: MC={len(results.get('Minecraft',[]))}, Discord={len(results.get('Discord',[]))}, OBS={len(results.get('OBS',[]))}, topCPU={len(top_cpu)}")
-    return results, top_cpu
+    debug_ts(f"scan_all_processes done: MC={len(results.get('Minecraft',[]))}, Discord={len(results.get('Discord',[]))}, OBS={len(results.get('OBS',[]))}, topCPU={len(top_cpu)}, other={len(other_candidates)}")
+    return results, top_cpu, other_candidates, {k: list(v) for k, v in unique_names.items()}
 
-def find_other_processes(known_pids):
-    """Find user-owned processes not in known sets and not critical OS services."""
+def sample_cpu_percent(procs):
+    """CPU usage of each process since the previous scan.
+    
+    Returns [(cpu_percent, proc)] for processes read by both scans. The first
+    scan has nothing to compare against, so it takes a baseline and waits
+    CPU_SAMPLE_SECONDS; later refreshes cost no wait, like the native path.
+    """
+    def read_all():
+        times = {}
+        for proc in procs:
+            try:
+                cpu = proc.cpu_times()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            times[proc] = cpu.user + cpu.system
+        return times
+    
+    if _last_cpu_sample['at'] is None:
+        _last_cpu_sample['at'] = time.monotonic()
+        _last_cpu_sample['times'] = read_all()
+        time.sleep(CPU_SAMPLE_SECONDS)
+    
+    now = time.monotonic()
+    times = read_all()
+    elapsed = now - _last_cpu_sample['at']
+    last_times = _last_cpu_sample['times']
+    _last_cpu_sample['at'] = now
+    _last_cpu_sample['times'] = times
+    # psutil.Process compares by pid + create time, so a reused PID finds no baseline
+    return [((cpu - last_times[proc]) * 100 / elapsed, proc)
+            for proc, cpu in times.items() if proc in last_times]
+
+def find_other_processes(candidates, known_pids):
+    """Read process details for "Other" candidates from scan_all_processes(), excluding known PIDs.
+    
+    Candidates are psutil.Process objects, or ProcInfo objects that are
+    already complete when they came from the native snapshot.
+    """
     debug_ts("find_other_processes start")
     procs = []
-    try:
-        current_user = psutil.Process(os.getpid()).username()
-    except Exception:
-        current_user = None
-
-    debug_ts("find_other_processes iterating")
-    for proc in psutil.process_iter(['pid', 'name', 'cpu_affinity', 'num_threads', 'username']):
+    for proc in candidates:
+        if isinstance(proc, ProcInfo):
+            if proc.pid not in known_pids:
+                procs.append(proc)
+            continue
+        if proc.pid in known_pids:
+            continue
         try:
-            pid = proc.info['pid']
-            name = (proc.info['name'] or '').lower()
-
-            if pid in known_pids:
-                continue
-
-            if not name or name in SKIP_ALWAYS:
-                continue
-
-            if current_user and proc.info.get('username') and proc.info['username'].lower() != current_user.lower():
-                continue
-
-            procs.append({
-                'pid': pid,
-                'name': proc.info['name'],
-                'threads': proc.info['num_threads'],
-                'cores': set(proc.cpu_affinity()),
-                'proc': proc
-            })
+            procs.append(get_proc_data(proc))
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
     debug_ts(f"find_other_processes done, found {len(procs)}")
     return procs
 
-def set_affinity_with_debug(procs, cores, app_name):
-    """Set affinity with detailed error reporting."""
-    results = []
-    for p in procs:
-        try:
-            p['proc'].cpu_affinity(cores)
-            results.append({
-                'pid': p['pid'],
-                'name': p['name'],
-                'success': True,
-                'error': None
-            })
-        except psutil.NoSuchProcess:
-            results.append({
-                'pid': p['pid'],
-                'name': p['name'],
-                'success': False,
-                'error': "Process no longer exists"
-            })
-        except psutil.AccessDenied:
-            results.append({
-                'pid': p['pid'],
-                'name': p['name'],
-                'success': False,
-                'error': "Access denied - may need higher privileges or process is protected"
-            })
-        except OSError as e:
-            results.append({
-                'pid': p['pid'],
-                'name': p['name'],
-                'success': False,
-                'error': f"OS Error: {e}"
-            })
-        except Exception as e:
-            results.append({
-                'pid': p['pid'],
-                'name': p['name'],
-                'success': False,
-                'error': f"{type(e).__name__}: {e}"
-            })
-    return results
+def set_affinity_native(pid, mask, create_time=None):
+    """Set affinity straight through SetProcessAffinityMask (Windows, <= 64 CPUs).
+    
+    With create_time (100 ns units, as in the native snapshot) the process must
+    still be the one scanned: if the PID was reused meanwhile this raises
+    psutil.NoSuchProcess rather than pinning the newcomer. Returns False if the
+    native path is unavailable or fails, so the caller can fall back to psutil,
+    which also produces the detailed error.
+    """
+    if _SetProcessAffinityMask is None or mask.bit_length() > ctypes.sizeof(ctypes.c_size_t) * 8:
+        return False
+    handle = _OpenProcess(PROCESS_SET_INFORMATION | PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return False
+    try:
+        if create_time is not None:
+            created, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            if not _GetProcessTimes(handle, ctypes.byref(created), ctypes.byref(exited),
+                                    ctypes.byref(kernel), ctypes.byref(user)):
+                return False
+            if (created.dwHighDateTime << 32 | created.dwLowDateTime) != create_time:
+                raise psutil.NoSuchProcess(pid)
+        return bool(_SetProcessAffinityMask(handle, mask))
+    finally:
+        _CloseHandle(handle)
+
+def set_affinity_one(p, mask, cores):
+    """Set affinity for one ProcInfo; returns its result entry (thread-safe)."""
+    try:
+        # psutil's own setter refuses a reused PID, the native one needs telling:
+        # snapshot entries pass their creation time, psutil entries ask is_running()
+        if _SetProcessAffinityMask is not None and p.proc is not None and not p.proc.is_running():
+            raise psutil.NoSuchProcess(p.pid, p.name)
+        if not set_affinity_native(p.pid, mask, p.create_time):
+            proc = p.proc
+            if proc is None:
+                # Snapshot entry: make sure the PID still names the process that was scanned
+                proc = psutil.Process(p.pid)
+                if abs(proc.create_time() - (p.create_time - FILETIME_UNIX_EPOCH) / 1e7) > 0.01:
+                    raise psutil.NoSuchProcess(p.pid, p.name)
+            proc.cpu_affinity(cores)
+        p.cores_mask = mask
+        return {
+            'pid': p.pid,
+            'name': p.name,
+            'success': True,
+            'error': None
+        }
+    except psutil.NoSuchProcess:
+        return {
+            'pid': p.pid,
+            'name': p.name,
+            'success': False,
+            'error': "Process no longer exists"
+        }
+    except psutil.AccessDenied:
+        return {
+            'pid': p.pid,
+            'name': p.name,
+            'success': False,
+            'error': "Access denied - may need higher privileges or process is protected"
+        }
+    except OSError as e:
+        return {
+            'pid': p.pid,
+            'name': p.name,
+            'success': False,
+            'error': f"OS Error: {e}"
+        }
+    except Exception as e:
+        return {
+            'pid': p.pid,
+            'name': p.name,
+            'success': False,
+            'error': f"{type(e).__name__}: {e}"
+        }
+
+def set_affinity_with_debug(procs, mask, app_name):
+    """Set affinity (given as a core bitmask) with detailed error reporting.
+    
+    Writes are pure syscalls that release the GIL, so larger groups are
+    spread over a small thread pool; results keep the order of procs.
+    """
+    cores = mask_to_cores(mask)
+    if len(procs) < AFFINITY_POOL_MIN:
+        return [set_affinity_one(p, mask, cores) for p in procs]
+    workers = min(AFFINITY_POOL_WORKERS, len(procs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda p: set_affinity_one(p, mask, cores), procs))
 
 # ============================================================================
 # CORE SELECTOR WIDGET
 # ============================================================================
 
-class CoreSelector(tk.Canvas):
-    """Visual core selector with P/E core colors and range selection."""
+# Rounded-rect sprites shared by all selectors, keyed by geometry and colors
+_SPRITES = {}
+
+def _rounded_row_inset(y, height, r):
+    """Horizontal inset of row y inside a rounded rect of the given height."""
+    if y < r:
+        dy = r - y - 0.5
+    elif y >= height - r:
+        dy = y - (height - r) + 0.5
+    else:
+        return 0
+    return int(round(r - math.sqrt(max(r * r - dy * dy, 0))))
+
+def get_rounded_sprite(width, height, r, fill, outline='', outline_width=0):
+    """Rasterize a rounded rectangle into a PhotoImage once and reuse it."""
+    key = (width, height, r, fill, outline, outline_width)
+    sprite = _SPRITES.get(key)
+    if sprite is not None:
+        return sprite
     
-    def __init__(self, parent, cpu_info, **kwargs):
+    # A new PhotoImage is fully transparent; only the shape's row spans are filled
+    sprite = tk.PhotoImage(width=width, height=height)
+    b = outline_width if outline else 0
+    for y in range(height):
+        inset = _rounded_row_inset(y, height, r)
+        sprite.put(outline or fill, to=(inset, y, width - inset, y + 1))
+        if b and b <= y < height - b:
+            inner = b + _rounded_row_inset(y - b, height - 2 * b, max(r - b, 0))
+            sprite.put(fill, to=(inner, y, width - inner, y + 1))
+    _SPRITES[key] = sprite
+    return sprite
+
+class CoreRow:
+    """One selectable row of cores, drawn on a shared MultiCoreSelector canvas."""
+    
+    def __init__(self, canvas, index, name):
+        self.canvas = canvas
+        self.index = index
+        self.name = name
+        self.total_cores = canvas.total_cores
+        
+        # Selection range (start, end) - both inclusive, default to all cores
+        self.start = 0
+        self.end = self.total_cores - 1
+        
+        # Top edge of this row on the shared canvas, and the unique tag on all its items
+        self.y = index * canvas.row_pitch
+        self.tag = canvas.new_row_tag()
+        
+        # Canvas item ids, created once and restyled in place
+        self._core_rects = []
+        self._core_nums = []
+        self._core_labels = []
+        self._drawn_range = None  # (start, end) currently shown on canvas
+        self._build_static()
+        self.draw()
+    
+    def _build_static(self):
+        """Create this row's canvas items once; draw() only restyles them."""
+        c = self.canvas
+        
+        # Row name, shortened to its column so it never runs into the track
+        c.create_text(
+            0, self.y + c.padding_y + c.core_height // 2,
+            text=c.fit_label(self.name), anchor='w', font=c.font_bold, fill=TEXT_BRIGHT,
+            tags=self.tag
+        )
+        
+        # Draw track background
+        track_x1 = c.cores_x - 4
+        track_y1 = self.y + c.padding_y - 4
+        track_x2 = c.cores_end + 4
+        track_y2 = self.y + c.padding_y + c.core_height + 4
+        c.create_rounded_rect(track_x1, track_y1, track_x2, track_y2, 8, fill=BG_TRACK, outline='',
+                              tags=self.tag)
+        
+        # Create each core; per-kind and P/E tags let draw() style whole groups in one call
+        y = self.y + c.padding_y
+        for i, x in enumerate(c.core_xs):
+            core_type = 'P' if c.is_p[i] else 'E'
+            
+            self._core_rects.append(c.create_image(
+                x, y, anchor='nw', tags=(self.tag, 'core', core_type)
+            ))
+            
+            # Core number
+            self._core_nums.append(c.create_text(
+                x + c.core_width // 2,
+                y + c.core_height // 2 - 6,
+                text=str(i),
+                font=c.font_num,
+                tags=(self.tag, 'num')
+            ))
+            
+            # P/E label
+            self._core_labels.append(c.create_text(
+                x + c.core_width // 2,
+                y + c.core_height // 2 + 10,
+                text=core_type,
+                font=c.font_small,
+                tags=(self.tag, 'label')
+            ))
+        
+        # Selection info
+        info_x = c.cores_end + c.core_spacing + 10
+        self._info_cores_id = c.create_text(
+            info_x, self.y + c.padding_y + c.core_height // 2 - 8,
+            anchor='w', font=c.font_bold, fill=TEXT_BRIGHT,
+            tags=self.tag
+        )
+        self._info_count_id = c.create_text(
+            info_x, self.y + c.padding_y + c.core_height // 2 + 10,
+            anchor='w', font=c.font_info, fill=TEXT_DIM,
+            tags=self.tag
+        )
+    
+    def move_to(self, index):
+        """Reposition the row's existing items for a new row index."""
+        dy = index * self.canvas.row_pitch - self.y
+        if dy:
+            self.canvas.move(self.tag, 0, dy)
+            self.y += dy
+        self.index = index
+    
+    def delete(self):
+        """Remove all of the row's items from the canvas."""
+        self.canvas.delete(self.tag)
+    
+    def _style_core(self, i, is_selected):
+        """Apply selected/unselected colors to one core's items."""
+        c = self.canvas
+        c.itemconfig(self._core_rects[i], image=c.sprites[(c.is_p[i], is_selected)])
+        if is_selected:
+            c.itemconfig(self._core_nums[i], fill=TEXT_BRIGHT)
+            c.itemconfig(self._core_labels[i], fill=TEXT_BRIGHT)
+        else:
+            c.itemconfig(self._core_nums[i], fill=TEXT_DIM)
+            c.itemconfig(self._core_labels[i], fill='#4a5568')
+    
+    def _style_all(self, is_selected):
+        """Apply selected/unselected colors to every core of the row via tags."""
+        c = self.canvas
+        text_fill = TEXT_BRIGHT if is_selected else TEXT_DIM
+        c.itemconfig(f'{self.tag}&&core&&P', image=c.sprites[(True, is_selected)])
+        c.itemconfig(f'{self.tag}&&core&&E', image=c.sprites[(False, is_selected)])
+        c.itemconfig(f'{self.tag}&&num', fill=text_fill)
+        c.itemconfig(f'{self.tag}&&label', fill=TEXT_BRIGHT if is_selected else '#4a5568')
+    
+    def draw(self):
+        """Update the row to show the current range, restyling only cores that changed."""
+        if self._drawn_range == (self.start, self.end):
+            return
+        
+        if self._drawn_range is None:
+            # First draw: style the whole row in a few tagged calls, then fix up the range
+            full = (self.start, self.end) == (0, self.total_cores - 1)
+            self._style_all(full)
+            old_start, old_end = (self.start, self.end) if full else (-1, -2)
+        else:
+            old_start, old_end = self._drawn_range
+        
+        lo = max(0, min(old_start, self.start))
+        hi = max(old_end, self.end)
+        for i in range(lo, hi + 1):
+            is_selected = self.start <= i <= self.end
+            if is_selected != (old_start <= i <= old_end):
+                self._style_core(i, is_selected)
+        
+        count = self.end - self.start + 1
+        self.canvas.itemconfig(self._info_cores_id, text=f"Cores {self.start}–{self.end}")
+        self.canvas.itemconfig(self._info_count_id, text=f"({count} selected)")
+        self._drawn_range = (self.start, self.end)
+    
+    def get_cores(self):
+        """Get list of selected cores."""
+        return list(range(self.start, self.end + 1))
+    
+    def get_mask(self):
+        """Get selected cores as an int bitmask."""
+        return ((1 << (self.end + 1)) - 1) ^ ((1 << self.start) - 1)
+    
+    def set_range(self, start, end):
+        """Set selection range."""
+        self.start = max(0, min(start, self.total_cores - 1))
+        self.end = max(0, min(end, self.total_cores - 1))
+        if self.start > self.end:
+            self.start, self.end = self.end, self.start
+        self.draw()
+
+class MultiCoreSelector(tk.Canvas):
+    """Visual core selector for several process groups on one canvas.
+    
+    Each row keeps its own range selection; geometry, sprites and mouse
+    handling are shared by all rows.
+    """
+    
+    def __init__(self, parent, cpu_info, row_names, **kwargs):
         super().__init__(parent, **kwargs)
         
         self.cpu_info = cpu_info
         self.total_cores = cpu_info['logical']
         self.core_types = cpu_info['core_types']
+        self.is_p = tuple(ct == 'P' for ct in self.core_types)
         self.threads_per_core = cpu_info['threads_per_core']
         self.physical_cores = cpu_info['physical']
         
-        # Selection range (start, end) - both inclusive, default to all cores
-        self.start = 0
-        self.end = self.total_cores - 1
-        
         # Drag state
         self.drag_anchor = None
+        self._drag_row = None
+        self._last_drag_core = None
+        self._redraw_pending = False
         
         # Dimensions
+        self.label_width = 190
         self.core_width = 32
         self.core_height = 36
         self.core_spacing = 4
         self.padding_x = 12
         self.padding_y = 10
         self.corner_radius = 6
+        self.row_gap = 8
+        self.cores_x = self.label_width + self.padding_x
+        self.row_height = self.core_height + self.padding_y * 2
+        self.row_pitch = self.row_height + self.row_gap
+        
+        # Core column positions, shared by every row and the hit test
+        self.core_step = self.core_width + self.core_spacing
+        self.core_xs = tuple(self.cores_x + i * self.core_step for i in range(self.total_cores))
+        self.cores_end = self.cores_x + self.total_cores * self.core_step - self.core_spacing
+        
+        # Configure size (height follows the row count, see set_rows)
+        width = self.cores_end + self.padding_x + 90
+        self.configure(width=width, bg=BG_MAIN, highlightthickness=0)
         
-        # Configure size
-        width = self.total_cores * (self.core_width + self.core_spacing) - self.core_spacing + self.padding_x * 2 + 90
-        height = self.core_height + self.padding_y * 2
-        self.configure(width=width, height=height, bg=BG_MAIN, highlightthickness=0)
+        # Pre-rasterized core shapes shared by every row: (is_p_core, is_selected) -> sprite
+        w, h, r = self.core_width, self.core_height, self.corner_radius
+        self.sprites = {
+            (True, False): get_rounded_sprite(w, h, r, P_CORE_BASE),
+            (True, True): get_rounded_sprite(w, h, r, P_CORE_SELECTED, BORDER_SELECTED, 2),
+            (False, False): get_rounded_sprite(w, h, r, E_CORE_BASE),
+            (False, True): get_rounded_sprite(w, h, r, E_CORE_SELECTED, BORDER_SELECTED, 2),
+        }
+        
+        # Named fonts, resolved once and shared by every text item
+        self.font_bold = tkfont.Font(self, family='Segoe UI', size=10, weight='bold')
+        self.font_info = tkfont.Font(self, family='Segoe UI', size=9)
+        self.font_small = tkfont.Font(self, family='Segoe UI', size=8)
+        self.font_num = tkfont.Font(self, family='Consolas', size=11, weight='bold')
         
         # Bind mouse events
         self.bind('<Button-1>', self.on_mouse_down)
         self.bind('<B1-Motion>', self.on_mouse_move)
         self.bind('<ButtonRelease-1>', self.on_mouse_up)
         
-        self.draw()
+        self.rows = []
+        self._row_counter = 0
+        self.set_rows(row_names)
+    
+    def new_row_tag(self):
+        """Return a canvas tag that no other row has used."""
+        self._row_counter += 1
+        return f"row{self._row_counter}"
+    
+    def set_rows(self, row_names):
+        """Show the given rows, reusing existing rows (and their selection) by name.
+        
+        Kept rows are moved into place rather than recreated; rows whose name
+        is gone are deleted.
+        """
+        existing = {row.name: row for row in self.rows}
+        rows = []
+        for i, name in enumerate(row_names):
+            row = existing.pop(name, None)
+            if row is None:
+                row = CoreRow(self, i, name)
+            else:
+                row.move_to(i)
+            rows.append(row)
+        for row in existing.values():
+            row.delete()
+        self.rows = rows
+        
+        # Any drag in progress referred to the old layout
+        self._flush_redraw()
+        self.drag_anchor = None
+        self._drag_row = None
+        self._last_drag_core = None
+        
+        self.configure(height=max(1, len(rows)) * self.row_pitch - self.row_gap)
     
     def create_rounded_rect(self, x1, y1, x2, y2, r, **kwargs):
         """Draw a rounded rectangle."""
@@ -313,126 +1017,93 @@ class CoreSelector(tk.Canvas):
         ]
         return self.create_polygon(points, smooth=True, **kwargs)
     
+    def fit_label(self, text):
+        """Shorten text with an ellipsis until it fits the row-name column."""
+        if self.font_bold.measure(text) <= self.label_width:
+            return text
+        while text and self.font_bold.measure(text + '…') > self.label_width:
+            text = text[:-1]
+        return text + '…'
+    
     def get_core_at_x(self, x):
         """Get core index from x coordinate."""
-        core_x = x - self.padding_x
-        if core_x < 0:
+        if x < self.cores_x:
             return 0
-        step = self.core_width + self.core_spacing
-        idx = int(core_x / step)
-        return max(0, min(idx, self.total_cores - 1))
+        return min(int(x - self.cores_x) // self.core_step, self.total_cores - 1)
+    
+    def get_row_at_y(self, y):
+        """Get the row under a y coordinate, or None for the gaps between rows."""
+        idx, offset = divmod(int(y), self.row_pitch)
+        if 0 <= idx < len(self.rows) and offset < self.row_height:
+            return self.rows[idx]
+        return None
     
     def on_mouse_down(self, event):
         """Start selection at clicked core."""
+        row = self.get_row_at_y(event.y)
+        if row is None or event.x < self.cores_x - 4:
+            return  # Gap between rows, or the row name column
         core = self.get_core_at_x(event.x)
+        self._drag_row = row
         self.drag_anchor = core
-        self.start = core
-        self.end = core
-        self.draw()
+        self._last_drag_core = core
+        row.start = core
+        row.end = core
+        row.draw()
     
     def on_mouse_move(self, event):
         """Expand selection as mouse moves."""
         if self.drag_anchor is None:
             return
         
+        # Motion fires far more often than the pointer crosses a core boundary
         core = self.get_core_at_x(event.x)
-        self.start = min(self.drag_anchor, core)
-        self.end = max(self.drag_anchor, core)
-        self.draw()
-    
-    def on_mouse_up(self, event):
-        """End selection."""
-        self.drag_anchor = None
-    
-    def draw(self):
-        """Redraw the selector."""
-        self.delete('all')
+        if core == self._last_drag_core:
+            return
+        self._last_drag_core = core
         
-        # Draw track background
-        track_x1 = self.padding_x - 4
-        track_y1 = self.padding_y - 4
-        track_x2 = self.padding_x + self.total_cores * (self.core_width + self.core_spacing) - self.core_spacing + 4
-        track_y2 = self.padding_y + self.core_height + 4
-        self.create_rounded_rect(track_x1, track_y1, track_x2, track_y2, 8, fill=BG_TRACK, outline='')
-        
-        # Draw each core
-        for i in range(self.total_cores):
-            x = self.padding_x + i * (self.core_width + self.core_spacing)
-            y = self.padding_y
-            
-            is_p_core = self.core_types[i] == 'P'
-            is_selected = self.start <= i <= self.end
-            
-            # Determine colors based on type and selection
-            if is_selected:
-                fill = P_CORE_SELECTED if is_p_core else E_CORE_SELECTED
-                outline = BORDER_SELECTED
-                outline_width = 2
-                text_color = TEXT_BRIGHT
-            else:
-                fill = P_CORE_BASE if is_p_core else E_CORE_BASE
-                outline = ''
-                outline_width = 0
-                text_color = TEXT_DIM
-            
-            # Draw core rounded rectangle
-            self.create_rounded_rect(
-                x, y,
-                x + self.core_width, y + self.core_height,
-                self.corner_radius,
-                fill=fill, outline=outline, width=outline_width
-            )
-            
-            # Draw core number
-            self.create_text(
-                x + self.core_width // 2,
-                y + self.core_height // 2 - 6,
-                text=str(i),
-                font=('Consolas', 11, 'bold'),
-                fill=text_color
-            )
-            
-            # Draw P/E label
-            label = "P" if is_p_core else "E"
-            self.create_text(
-                x + self.core_width // 2,
-                y + self.core_height // 2 + 10,
-                text=label,
-                font=('Segoe UI', 8),
-                fill=text_color if is_selected else '#4a5568'
-            )
-        
-        # Draw selection info
-        info_x = self.padding_x + self.total_cores * (self.core_width + self.core_spacing) + 10
-        count = self.end - self.start + 1
+        row = self._drag_row
+        start = min(self.drag_anchor, core)
+        end = max(self.drag_anchor, core)
+        if (start, end) == (row.start, row.end):
+            return
+        row.start = start
+        row.end = end
         
-        self.create_text(
-            info_x, self.padding_y + self.core_height // 2 - 8,
-            text=f"Cores {self.start}–{self.end}",
-            anchor='w', font=('Segoe UI', 10, 'bold'), fill=TEXT_BRIGHT
-        )
-        self.create_text(
-            info_x, self.padding_y + self.core_height // 2 + 10,
-            text=f"({count} selected)",
-            anchor='w', font=('Segoe UI', 9), fill=TEXT_DIM
-        )
+        # Coalesce bursts of motion events into one redraw per idle tick
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._flush_redraw)
     
-    def get_cores(self):
-        """Get list of selected cores."""
-        return list(range(self.start, self.end + 1))
+    def _flush_redraw(self):
+        """Run the redraw scheduled by on_mouse_move."""
+        self._redraw_pending = False
+        if self._drag_row is not None:
+            self._drag_row.draw()
     
-    def set_range(self, start, end):
-        """Set selection range."""
-        self.start = max(0, min(start, self.total_cores - 1))
-        self.end = max(0, min(end, self.total_cores - 1))
-        if self.start > self.end:
-            self.start, self.end = self.end, self.start
-        self.draw()
+    def on_mouse_up(self, event):
+        """End selection."""
+        # Draw the final range before forgetting which row was dragged
+        self._flush_redraw()
+        self.drag_anchor = None
+        self._drag_row = None
+        self._last_drag_core = None
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
+class Group:
+    """A detected process group and the selector row/label that show it."""
+    __slots__ = ('patterns', 'procs', 'names', 'selector', 'label')
+    
+    def __init__(self, patterns, procs, names):
+        self.patterns = patterns
+        self.procs = procs
+        self.names = names  # distinct process names, collected during the scan
+        self.selector = None
+        self.label = None
+
 class AffinityManagerApp:
     def __init__(self, root):
         debug_ts("AffinityManagerApp.__init__ start")
@@ -454,17 +1125,18 @@ class AffinityManagerApp:
         debug_ts("get_cpu_info start")
         self.cpu_info = get_cpu_info()
         debug_ts("get_cpu_info done")
-        self.active_groups = {}  # name -> (patterns, procs, selector, label)
+        self.active_groups = {}  # name -> Group
         self.other_procs = []
+        self.known_pids = set()
+        self.selector = None
         self.other_discovery_done = False
+        self._refreshing = False
+        self._scan_done_at = float('-inf')  # time.monotonic() of the last completed scan
         
-        debug_ts("refresh_processes_sync start")
-        self.refresh_processes_sync()  # Sync discovery of known patterns + top CPU FIRST
-        debug_ts("refresh_processes_sync done")
         debug_ts("build_gui start")
-        self.build_gui()  # Then build GUI with discovered processes
+        self.build_gui()  # Show the window right away; processes are scanned in the background
         debug_ts("build_gui done")
-        self.start_async_other_discovery()  # Async discovery of "Other"
+        self.root.after_idle(self.on_refresh)  # First scan starts once mainloop is running
         debug_ts("AffinityManagerApp.__init__ done")
     
     def setup_dark_theme(self):
@@ -483,71 +1155,90 @@ class AffinityManagerApp:
                        borderwidth=1, focuscolor='none', padding=6)
         style.map('TButton', background=[('active', '#2ea043'), ('disabled', '#1f1f1f')],
                   foreground=[('disabled', '#666666')])
-    
-    def refresh_processes_sync(self):
-        """Synchronously discover known programs and top CPU process in single pass."""
-        self.active_groups.clear()
         
-        # Single pass discovery
-        results, top_cpu = discover_all_processes_single_pass()
+        style.configure('Treeview', background=BG_FRAME, fieldbackground=BG_FRAME,
+                       foreground=TEXT_BRIGHT, rowheight=20)
+        style.configure('Treeview.Heading', background=BG_TRACK, foreground=TEXT_BRIGHT)
+        style.map('Treeview', background=[('selected', BTN_BG)])
+        
+        # Named label styles: each font is resolved once per style, not per widget
+        style.configure('Title.TLabel', font=('Segoe UI', 14, 'bold'))
+        style.configure('Subtitle.TLabel', font=('Segoe UI', 9, 'italic'))
+        style.configure('Info.TLabel', font=('Segoe UI', 10))
+        style.configure('Legend.TLabel', font=('Segoe UI', 9))
+        style.configure('Disclaimer.TLabel', font=('Segoe UI', 8), foreground=TEXT_DIM)
+        style.configure('Status.TLabel', font=('Segoe UI', 9))
+    
+    def build_groups(self, results, top_cpu, unique_names):
+        """Turn scan results into active groups.
         
+        Returns (groups, known_pids); safe off the main thread.
+        """
+        groups = {}
         all_pids = set()
         
         # Add discovered categories
         for name, procs in results.items():
             if procs:  # Only add if running
-                all_pids.update(p['pid'] for p in procs)
-                self.active_groups[name] = (KNOWN_PATTERNS[name], procs, None, None)
+                all_pids.update(p.pid for p in procs)
+                groups[name] = Group(KNOWN_PATTERNS[name], procs, unique_names[name])
         
         # Add top CPU process
         if top_cpu:
-            top_name = f"Top CPU ({top_cpu[0]['name']})"
-            all_pids.add(top_cpu[0]['pid'])
-            self.active_groups[top_name] = ([], top_cpu, None, None)
+            top_name = f"Top CPU ({top_cpu[0].name})"
+            all_pids.add(top_cpu[0].pid)
+            groups[top_name] = Group([], top_cpu, [top_cpu[0].name])
         
-        self.known_pids = all_pids
+        return groups, all_pids
     
-    def start_async_other_discovery(self):
-        """Start async discovery of 'Other' processes."""
-        debug_ts("start_async_other_discovery start")
-        self.other_discovery_done = False
-        if hasattr(self, 'other_selector'):
-            self.other_selector.configure(state='disabled')
-        if hasattr(self, 'apply_btn'):
-            self.apply_btn.configure(state='disabled')
-        
-        def discover():
-            debug_ts("async discover thread started")
-            time.sleep(0.1)  # Small delay to let UI render
-            debug_ts("calling find_other_processes")
-            self.other_procs = find_other_processes(self.known_pids)
-            debug_ts(f"find_other_processes done, found {len(self.other_procs)}")
-            self.other_discovery_done = True
+    def _refresh_worker(self):
+        """Scan processes off the Tk thread and post each stage back with root.after."""
+        debug_ts("refresh worker started")
+        try:
+            results, top_cpu, other_candidates, unique_names = scan_all_processes()
+            groups, known_pids = self.build_groups(results, top_cpu, unique_names)
+            self.root.after(0, self._apply_scan_results, groups, known_pids)
             
-            # Update UI on main thread
-            self.root.after(0, self.on_other_discovery_complete)
-            debug_ts("async discover thread done")
-        
-        debug_ts("creating thread")
-        thread = threading.Thread(target=discover, daemon=True)
-        debug_ts("starting thread")
-        thread.start()
-        debug_ts("start_async_other_discovery done")
-    
-    def on_other_discovery_complete(self):
-        """Called when async discovery completes."""
-        if hasattr(self, 'apply_btn'):
-            self.apply_btn.configure(state='normal')
+            other_procs = find_other_processes(other_candidates, known_pids)
+            self.root.after(0, self._apply_other_results, other_procs)
+        except Exception as e:
+            self.root.after(0, self._on_refresh_failed, e)
+        debug_ts("refresh worker done")
+    
+    def _apply_scan_results(self, groups, known_pids):
+        """Update selectors for newly discovered groups (main thread)."""
+        for widget in self.group_label_frame.winfo_children():
+            widget.destroy()
+        
+        self.active_groups = groups
+        self.known_pids = known_pids
+        self.build_selectors()
+        self.status_label.config(text="Loading other processes...")
+    
+    def _apply_other_results(self, other_procs):
+        """Store "Other" processes and re-enable Apply (main thread)."""
+        self.other_procs = other_procs
+        self.other_discovery_done = True
+        self._refreshing = False
+        self._scan_done_at = time.monotonic()
+        self.apply_btn.configure(state='normal')
         self.update_other_label()
         self.status_label.config(text="Ready")
     
+    def _on_refresh_failed(self, error):
+        """Report a failed background scan (main thread)."""
+        self._refreshing = False
+        self.status_label.config(text=f"❌ Scan failed: {error}")
+    
     def build_gui(self):
         # Create main scrollable frame
         main_canvas = tk.Canvas(self.root, bg=BG_MAIN, highlightthickness=0)
         scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=main_canvas.yview)
         main_frame = ttk.Frame(main_canvas)
         
-        main_frame.bind("<Configure>", lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all")))
+        # The frame is the canvas's only item, so its new size is the scroll region;
+        # <Configure> on the frame fires only when that size actually changes
+        main_frame.bind("<Configure>", lambda e: main_canvas.configure(scrollregion=(0, 0, e.width, e.height)))
         
         main_canvas.create_window((0, 0), window=main_frame, anchor="nw")
         main_canvas.configure(yscrollcommand=scrollbar.set)
@@ -559,10 +1250,9 @@ class AffinityManagerApp:
         main.grid(row=0, column=0, sticky="nsew")
         
         # Title
-        title_label = ttk.Label(main, text="🎮 Affinity Manager", 
-                 font=('Segoe UI', 14, 'bold'))
+        title_label = ttk.Label(main, text="🎮 Affinity Manager", style='Title.TLabel')
         title_label.grid(row=0, column=0, columnspan=2, pady=(0, 2))
-        author_label = ttk.Label(main, text="by wizard1", font=('Segoe UI', 9, 'italic'))
+        author_label = ttk.Label(main, text="by wizard1", style='Subtitle.TLabel')
         author_label.grid(row=1, column=0, columnspan=2, pady=(0, 10))
         
         # CPU Info
@@ -575,7 +1265,7 @@ class AffinityManagerApp:
             info_text += f"  •  Hybrid: {cpu['p_cores']}P + {cpu['e_cores']}E"
         if cpu['threads_per_core'] > 1:
             info_text += f"  •  SMT/HT: {cpu['threads_per_core']} threads/core"
-        ttk.Label(info_frame, text=info_text, font=('Segoe UI', 10)).grid(row=0, column=0, sticky='w')
+        ttk.Label(info_frame, text=info_text, style='Info.TLabel').grid(row=0, column=0, sticky='w')
         
         # Legend
         legend_frame = ttk.Frame(info_frame)
@@ -584,22 +1274,43 @@ class AffinityManagerApp:
         p_canvas = tk.Canvas(legend_frame, width=24, height=16, highlightthickness=0, bg=BG_MAIN)
         p_canvas.grid(row=0, column=0, padx=(0, 5))
         p_canvas.create_rectangle(2, 2, 22, 14, fill=P_CORE_SELECTED, outline='')
-        ttk.Label(legend_frame, text=f"P-core ({cpu['p_count']})", font=('Segoe UI', 9)).grid(row=0, column=1, padx=(0, 20))
+        ttk.Label(legend_frame, text=f"P-core ({cpu['p_count']})", style='Legend.TLabel').grid(row=0, column=1, padx=(0, 20))
         
         if cpu['e_count'] > 0:
             e_canvas = tk.Canvas(legend_frame, width=24, height=16, highlightthickness=0, bg=BG_MAIN)
             e_canvas.grid(row=0, column=2, padx=(0, 5))
             e_canvas.create_rectangle(2, 2, 22, 14, fill=E_CORE_SELECTED, outline='')
-            ttk.Label(legend_frame, text=f"E-core ({cpu['e_count']})", font=('Segoe UI', 9)).grid(row=0, column=3, padx=(0, 20))
+            ttk.Label(legend_frame, text=f"E-core ({cpu['e_count']})", style='Legend.TLabel').grid(row=0, column=3, padx=(0, 20))
         
         s_canvas = tk.Canvas(legend_frame, width=24, height=16, highlightthickness=0, bg=BG_MAIN)
         s_canvas.grid(row=0, column=4, padx=(0, 5))
         s_canvas.create_rectangle(2, 2, 22, 14, fill='#333', outline=BORDER_SELECTED, width=2)
-        ttk.Label(legend_frame, text="Selected", font=('Segoe UI', 9)).grid(row=0, column=5)
+        ttk.Label(legend_frame, text="Selected", style='Legend.TLabel').grid(row=0, column=5)
         
         # Detected processes
         self.detect_frame = ttk.LabelFrame(main, text="Detected Processes", padding=10)
         self.detect_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+        self.detect_frame.columnconfigure(0, weight=1)
+        
+        self.group_label_frame = ttk.Frame(self.detect_frame)
+        self.group_label_frame.grid(row=0, column=0, sticky="w")
+        self.other_label = ttk.Label(self.detect_frame, text="⏳ Other: scanning...")
+        self.other_label.grid(row=1, column=0, sticky="w")
+        
+        # Per-process view of "Other"
+        tree_frame = ttk.Frame(self.detect_frame)
+        tree_frame.grid(row=2, column=0, sticky="ew", pady=(6, 0))
+        tree_frame.columnconfigure(0, weight=1)
+        self.other_tree = ttk.Treeview(tree_frame, columns=('pid', 'name', 'threads', 'cores'),
+                                       show='headings', height=8)
+        for col, heading, width, anchor in (('pid', "PID", 80, 'e'), ('name', "Name", 320, 'w'),
+                                            ('threads', "Threads", 80, 'e'), ('cores', "Set by app", 160, 'w')):
+            self.other_tree.heading(col, text=heading, anchor=anchor)
+            self.other_tree.column(col, width=width, anchor=anchor, stretch=(col == 'name'))
+        tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.other_tree.yview)
+        self.other_tree.configure(yscrollcommand=tree_scroll.set)
+        self.other_tree.grid(row=0, column=0, sticky="ew")
+        tree_scroll.grid(row=0, column=1, sticky="ns")
         
         # Core selectors
         self.selector_frame = ttk.LabelFrame(main, text="Core Allocation — click and drag to select range", padding=10)
@@ -607,21 +1318,14 @@ class AffinityManagerApp:
         
         self.build_selectors()
         
-        # "Other" processes selector
-        other_row = ttk.Frame(self.selector_frame)
-        other_row.grid(row=len(self.active_groups), column=0, sticky='w', pady=4)
-        ttk.Label(other_row, text="Other", font=('Segoe UI', 10, 'bold'), width=25, anchor='w').pack(side='left')
-        self.other_selector = CoreSelector(other_row, self.cpu_info)
-        self.other_selector.pack(side='left', padx=(5, 0))
-        
         # Disclaimer
         disclaimer_frame = ttk.Frame(main)
         disclaimer_frame.grid(row=5, column=0, columnspan=2, pady=(0, 10))
         disclaimer_text = ("⚠️ NOT GUARANTEED TO IMPROVE PERFORMANCE • RESTART PROCESS = SETTINGS REVERT!\n"
                           "This tool compartmentalizes CPU load to prevent one process from slowing another.\n"
                           "If no background processes are intensive, this may not help you at all.")
-        ttk.Label(disclaimer_frame, text=disclaimer_text, font=('Segoe UI', 8), 
-                 foreground=TEXT_DIM, justify='center').pack()
+        ttk.Label(disclaimer_frame, text=disclaimer_text, style='Disclaimer.TLabel',
+                 justify='center').pack()
         
         # Buttons
         btn_frame = ttk.Frame(main)
@@ -632,82 +1336,69 @@ class AffinityManagerApp:
         self.apply_btn.pack(side="left", padx=5)
         
         # Status
-        self.status_label = ttk.Label(main, text="Loading other processes...", font=('Segoe UI', 9))
+        self.status_label = ttk.Label(main, text="Scanning...", style='Status.TLabel')
         self.status_label.grid(row=7, column=0, columnspan=2)
     
     def build_selectors(self):
-        """Build selector rows for active groups."""
-        row_idx = 0
-        for name, (patterns, procs, _, _) in self.active_groups.items():
-            row = ttk.Frame(self.selector_frame)
-            row.grid(row=row_idx, column=0, sticky='w', pady=4)
-            
-            ttk.Label(row, text=name, font=('Segoe UI', 10, 'bold'), width=25, anchor='w').pack(side='left')
-            
-            selector = CoreSelector(row, self.cpu_info)
-            selector.pack(side='left', padx=(5, 0))
+        """Show one shared selector canvas with a row per active group plus "Other"."""
+        names = list(self.active_groups) + ["Other"]
+        if self.selector is None:
+            self.selector = MultiCoreSelector(self.selector_frame, self.cpu_info, names)
+            self.selector.grid(row=0, column=0, sticky='w', pady=4)
+        else:
+            self.selector.set_rows(names)
+        self.other_selector = self.selector.rows[-1]
+        
+        for row_idx, (name, group) in enumerate(self.active_groups.items()):
+            group.selector = self.selector.rows[row_idx]
             
             # Create label in detect frame
-            label = ttk.Label(self.detect_frame, text="")
-            label.grid(row=row_idx, column=0, sticky="w")
-            
-            # Update active_groups with selector and label
-            self.active_groups[name] = (patterns, procs, selector, label)
+            group.label = ttk.Label(self.group_label_frame, text="")
+            group.label.grid(row=row_idx, column=0, sticky="w")
             self.update_process_label(name)
-            
-            row_idx += 1
     
     def update_process_label(self, name):
         """Update process label for a group."""
-        patterns, procs, selector, label = self.active_groups[name]
-        if not procs:
-            label.config(text=f"❌ {name}: Not running")
+        group = self.active_groups[name]
+        if not group.procs:
+            group.label.config(text=f"❌ {name}: Not running")
         else:
-            names = set(p['name'] for p in procs)
-            threads = sum(p['threads'] for p in procs)
-            label.config(text=f"✅ {name}: {', '.join(names)} ({threads} threads)")
+            threads = sum(p.threads for p in group.procs)
+            group.label.config(text=f"✅ {name}: {', '.join(group.names)} ({threads} threads)")
     
     def update_other_label(self):
-        """Update the Other processes label."""
+        """Update the Other processes label and per-process table."""
         count = len(self.other_procs)
-        threads = sum(p['threads'] for p in self.other_procs)
-        
-        # Find or create Other label
-        found = False
-        for child in self.detect_frame.winfo_children():
-            if isinstance(child, ttk.Label):
-                text = child.cget('text')
-                if 'Other:' in text or (not text and not found):
-                    if self.other_procs:
-                        child.config(text=f"✅ Other: {count} processes ({threads} threads) — excludes system processes")
-                    else:
-                        child.config(text="❌ Other: none")
-                    found = True
-                    break
-        
-        if not found and self.other_procs:
-            label = ttk.Label(self.detect_frame, text=f"✅ Other: {count} processes ({threads} threads) — excludes system processes")
-            label.grid(row=len(self.active_groups), column=0, sticky="w")
-    
-    def on_refresh(self):
-        # Clear selectors
-        for widget in self.selector_frame.winfo_children():
-            widget.destroy()
-        for widget in self.detect_frame.winfo_children():
-            widget.destroy()
+        threads = sum(p.threads for p in self.other_procs)
         
-        self.refresh_processes_sync()
-        self.build_selectors()
+        if self.other_procs:
+            self.other_label.config(text=f"✅ Other: {count} processes ({threads} threads) — excludes system processes")
+        else:
+            self.other_label.config(text="❌ Other: none")
         
-        # Re-add Other selector
-        other_row = ttk.Frame(self.selector_frame)
-        other_row.grid(row=len(self.active_groups), column=0, sticky='w', pady=4)
-        ttk.Label(other_row, text="Other", font=('Segoe UI', 10, 'bold'), width=25, anchor='w').pack(side='left')
-        self.other_selector = CoreSelector(other_row, self.cpu_info)
-        self.other_selector.pack(side='left', padx=(5, 0))
+        # Clear and bulk-insert; the Treeview renders rows natively
+        tree = self.other_tree
+        tree.delete(*tree.get_children())
+        for p in sorted(self.other_procs, key=lambda p: p.name.lower()):
+            tree.insert('', 'end', values=(p.pid, p.name, p.threads, format_mask(p.cores_mask) or '—'))
+    
+    def on_refresh(self):
+        """Start a background rescan.
         
-        self.start_async_other_discovery()
-        self.status_label.config(text="Refreshing...")
+        Ignored while one is already running; if the last scan finished less
+        than SCAN_REUSE_SECONDS ago its results are still current, which the
+        status line says instead of rescanning.
+        """
+        if self._refreshing:
+            return
+        if time.monotonic() - self._scan_done_at < SCAN_REUSE_SECONDS:
+            self.status_label.config(text="Up to date")
+            return
+        self._refreshing = True
+        self.other_discovery_done = False
+        self.apply_btn.configure(state='disabled')
+        self.status_label.config(text="Scanning...")
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
     
     def validate_other_affinity(self, cores, threads):
         """Check if Other affinity settings are reasonable."""
@@ -741,17 +1432,19 @@ class AffinityManagerApp:
         errors = []
         
         # Apply for each active group
-        for name, (patterns, procs, selector, label) in self.active_groups.items():
-            cores = selector.get_cores()
-            if not procs or not cores:
+        for name, group in self.active_groups.items():
+            mask = group.selector.get_mask()
+            if not group.procs or not mask:
                 continue
             
-            results = set_affinity_with_debug(procs, cores, name)
+            results = set_affinity_with_debug(group.procs, mask, name)
             
             ok = sum(1 for r in results if r['success'])
             failed = [r for r in results if not r['success']]
             
-            all_results.append(f"{name}: {ok} OK → Cores {min(cores)}-{max(cores)}")
+            lo, hi = mask_bounds(mask)
+            summary = f"{name}: {ok} OK → Cores {lo}-{hi}"
+            all_results.append(summary)
             
             for f in failed:
                 errors.append(f"❌ {f['name']} (PID {f['pid']}):\n   {f['error']}")
@@ -759,7 +1452,7 @@ class AffinityManagerApp:
         # Apply for Other with validation
         if self.other_procs:
             cores = self.other_selector.get_cores()
-            threads = sum(p['threads'] for p in self.other_procs)
+            threads = sum(p.threads for p in self.other_procs)
             
             valid, warning_msg = self.validate_other_affinity(cores, threads)
             if not valid:
@@ -768,12 +1461,16 @@ class AffinityManagerApp:
                     return  # User cancelled
             
             if cores:
-                results = set_affinity_with_debug(self.other_procs, cores, "Other")
+                mask = self.other_selector.get_mask()
+                results = set_affinity_with_debug(self.other_procs, mask, "Other")
                 ok = sum(1 for r in results if r['success'])
                 failed = [r for r in results if not r['success']]
-                all_results.append(f"Other: {ok} OK → Cores {min(cores)}-{max(cores)}")
+                lo, hi = mask_bounds(mask)
+                summary = f"Other: {ok} OK → Cores {lo}-{hi}"
+                all_results.append(summary)
                 for f in failed:
                     errors.append(f"❌ {f['name']} (PID {f['pid']}):\n   {f['error']}")
+                self.update_other_label()
         
         if not all_results:
             messagebox.showwarning("Warning", "No processes to update!")
@@ -799,9 +1496,12 @@ def run_as_admin():
     """Relaunch the script with admin privileges via UAC."""
     try:
         script = sys.argv[0]
-        ctypes.windll.shell32.ShellExecuteW(
+        result = _ShellExecuteW(
             None, "runas", sys.executable, f'"{script}"', None, 1
         )
+        # ShellExecuteW reports failure (e.g. UAC prompt declined) as a value <= 32
+        if (result or 0) <= 32:
+            raise OSError(f"ShellExecuteW returned {result or 0}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to elevate privileges:\n{e}")
 
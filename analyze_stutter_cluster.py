@@ -1,130 +1,116 @@
-import csv
-import statistics
+import numpy as np
+from presentmon import load_presentmon
 
 # Deep dive into what happens during the big stutter cluster at ~7-12s
-with open(r'C:\Users\Terac\Documents\PresentMon\Captures\wizSS\pmcap-javaw.exe-251207-105743.csv', 'r') as f:
-    reader = csv.reader(f)
-    header = next(reader)
-    
-    idx_time = header.index('TimeInSeconds')
-    idx_between_presents = header.index('MsBetweenPresents')
-    idx_cpu_busy = header.index('MsCPUBusy')
-    idx_gpu_busy = header.index('MsGPUBusy')
-    idx_gpu_util = header.index('GPUUtilization')
-    idx_cpu_util = header.index('CPUUtilization')
-    idx_cpu_freq = header.index('CPUFrequency')
-    idx_gpu_freq = header.index('GPUFrequency')
-    idx_present_mode = header.index('PresentMode')
-    
-    rows = list(reader)
-    
-    # Get frames during stutter period (7-13s) vs normal period (50-60s)
-    stutter_frames = []
-    normal_frames = []
-    
-    for row in rows:
-        try:
-            t = float(row[idx_time])
-            bp = float(row[idx_between_presents])
-            cpu_busy = float(row[idx_cpu_busy]) if row[idx_cpu_busy] else 0
-            gpu_busy = float(row[idx_gpu_busy]) if row[idx_gpu_busy] else 0
-            cpu_util = float(row[idx_cpu_util]) if row[idx_cpu_util] else 0
-            cpu_freq = float(row[idx_cpu_freq]) if row[idx_cpu_freq] else 0
-            gpu_freq = float(row[idx_gpu_freq]) if row[idx_gpu_freq] else 0
-            
-            frame = {
-                'time': t,
-                'frame_time': bp,
-                'cpu_busy': cpu_busy,
-                'gpu_busy': gpu_busy,
-                'cpu_util': cpu_util,
-                'cpu_freq': cpu_freq,
-                'gpu_freq': gpu_freq
-            }
-            
-            if 7 <= t <= 13:
-                stutter_frames.append(frame)
-            elif 50 <= t <= 60:
-                normal_frames.append(frame)
-        except:
-            pass
-    
-    print("=== Comparison: Stutter Period (7-13s) vs Normal Period (50-60s) ===\n")
-    
-    def summarize(name, frames):
-        if not frames:
-            print(f"{name}: No data")
-            return
-        print(f"{name}:")
-        print(f"  Frames: {len(frames)}")
-        ft = [f['frame_time'] for f in frames]
-        print(f"  Frame time: avg={statistics.mean(ft):.2f}ms, med={statistics.median(ft):.2f}ms, max={max(ft):.2f}ms")
-        print(f"  Effective FPS: {1000/statistics.mean(ft):.1f}")
-        
-        cpu = [f['cpu_busy'] for f in frames if f['cpu_busy']]
-        gpu = [f['gpu_busy'] for f in frames if f['gpu_busy']]
-        cpu_util = [f['cpu_util'] for f in frames if f['cpu_util']]
-        
-        if cpu:
-            print(f"  CPU busy: avg={statistics.mean(cpu):.2f}ms, max={max(cpu):.2f}ms")
-        if gpu:
-            print(f"  GPU busy: avg={statistics.mean(gpu):.2f}ms, max={max(gpu):.2f}ms")
-        if cpu_util:
-            print(f"  CPU util: avg={statistics.mean(cpu_util):.1f}%, max={max(cpu_util):.1f}%")
-        
-        # Count frames over threshold
-        over_16 = len([f for f in frames if f['frame_time'] > 16.67])
-        over_33 = len([f for f in frames if f['frame_time'] > 33.33])
-        print(f"  Frames >16.67ms (60fps): {over_16} ({100*over_16/len(frames):.1f}%)")
-        print(f"  Frames >33.33ms (30fps): {over_33} ({100*over_33/len(frames):.1f}%)")
-        print()
-    
-    summarize("Stutter Period (7-13s)", stutter_frames)
-    summarize("Normal Period (50-60s)", normal_frames)
-    
-    # Look at the exact frames around the worst stutter (10.9s, 331ms)
-    print("=== Frames around worst stutter (10.2s-11.5s) ===")
-    for row in rows:
-        try:
-            t = float(row[idx_time])
-            if 10.0 <= t <= 11.5:
-                bp = float(row[idx_between_presents])
-                cpu_busy = float(row[idx_cpu_busy]) if row[idx_cpu_busy] else 0
-                gpu_busy = float(row[idx_gpu_busy]) if row[idx_gpu_busy] else 0
-                if bp > 10:  # Only show significant frames
-                    print(f"  {t:.3f}s: {bp:.1f}ms (CPU:{cpu_busy:.1f}ms, GPU:{gpu_busy:.1f}ms)")
-        except:
-            pass
-
-    # Frame time histogram
-    print("\n=== Frame Time Distribution (all frames) ===")
-    all_ft = [float(row[idx_between_presents]) for row in rows if row[idx_between_presents]]
-    
-    buckets = {
-        '<4ms (250+ fps)': 0,
-        '4-8ms (125-250 fps)': 0,
-        '8-16ms (60-125 fps)': 0,
-        '16-33ms (30-60 fps)': 0,
-        '33-100ms (10-30 fps)': 0,
-        '>100ms (<10 fps)': 0
-    }
-    
-    for ft in all_ft:
-        if ft < 4:
-            buckets['<4ms (250+ fps)'] += 1
-        elif ft < 8:
-            buckets['4-8ms (125-250 fps)'] += 1
-        elif ft < 16:
-            buckets['8-16ms (60-125 fps)'] += 1
-        elif ft < 33:
-            buckets['16-33ms (30-60 fps)'] += 1
-        elif ft < 100:
-            buckets['33-100ms (10-30 fps)'] += 1
-        else:
-            buckets['>100ms (<10 fps)'] += 1
-    
-    total = len(all_ft)
-    for bucket, count in buckets.items():
-        bar = '#' * int(50 * count / total)
-        print(f"  {bucket:25s}: {count:6d} ({100*count/total:5.1f}%) {bar}")
+CAPTURE = r'C:\Users\Terac\Documents\PresentMon\Captures\wizSS\pmcap-javaw.exe-251207-105743.csv'
+COLUMNS = ['TimeInSeconds', 'MsBetweenPresents', 'MsCPUBusy', 'MsGPUBusy', 'GPUUtilization',
+           'CPUUtilization', 'CPUFrequency', 'GPUFrequency']
+
+table = load_presentmon(CAPTURE, COLUMNS)
+# Time and frame time stay NaN where missing (those frames never match a window);
+# the other fields read as 0 when missing
+col_time = table.column('TimeInSeconds').to_numpy()
+col_between_presents = table.column('MsBetweenPresents').to_numpy()
+col_cpu_busy = table.column('MsCPUBusy').fill_null(0).to_numpy()
+col_gpu_busy = table.column('MsGPUBusy').fill_null(0).to_numpy()
+col_cpu_util = table.column('CPUUtilization').fill_null(0).to_numpy()
+col_cpu_freq = table.column('CPUFrequency').fill_null(0).to_numpy()
+col_gpu_freq = table.column('GPUFrequency').fill_null(0).to_numpy()
+
+# One record per frame: frames['frame_time'] is a single-column view for the
+# reductions, while walking the array row by row reads each frame's fields together
+FRAME_DTYPE = np.dtype([('time', 'f8'), ('frame_time', 'f4'), ('cpu_busy', 'f4'), ('gpu_busy', 'f4'),
+                        ('cpu_util', 'f4'), ('cpu_freq', 'f4'), ('gpu_freq', 'f4')])
+
+def select_frames(mask):
+    """The frames in mask, as a structured array of FRAME_DTYPE."""
+    frames = np.empty(np.count_nonzero(mask), dtype=FRAME_DTYPE)
+    frames['time'] = col_time[mask]
+    frames['frame_time'] = col_between_presents[mask]
+    frames['cpu_busy'] = col_cpu_busy[mask]
+    frames['gpu_busy'] = col_gpu_busy[mask]
+    frames['cpu_util'] = col_cpu_util[mask]
+    frames['cpu_freq'] = col_cpu_freq[mask]
+    frames['gpu_freq'] = col_gpu_freq[mask]
+    return frames
+
+# Get frames during stutter period (7-13s) vs normal period (50-60s)
+valid = ~np.isnan(col_between_presents)
+stutter_frames = select_frames(valid & (col_time >= 7) & (col_time <= 13))
+normal_frames = select_frames(valid & (col_time >= 50) & (col_time <= 60))
+
+print("=== Comparison: Stutter Period (7-13s) vs Normal Period (50-60s) ===\n")
+
+def summarize(name, frames):
+    ft = frames['frame_time']
+    if not len(ft):
+        print(f"{name}: No data")
+        return
+    print(f"{name}:")
+    print(f"  Frames: {len(ft)}")
+    avg = ft.mean(dtype=np.float64)  # Accumulate float32 columns in float64
+    print(f"  Frame time: avg={avg:.2f}ms, med={np.median(ft):.2f}ms, max={ft.max():.2f}ms")
+    # The tail is where stutter shows; 'lower' reports real frame times, not interpolated ones
+    p95, p99, p999 = np.quantile(ft, [0.95, 0.99, 0.999], method='lower')
+    print(f"  Frame time tail: p95={p95:.2f}ms, p99={p99:.2f}ms, p99.9={p999:.2f}ms")
+    print(f"  Effective FPS: {1000/avg:.1f}")
+
+    cpu = frames['cpu_busy'][frames['cpu_busy'] != 0]
+    gpu = frames['gpu_busy'][frames['gpu_busy'] != 0]
+    cpu_util = frames['cpu_util'][frames['cpu_util'] != 0]
+
+    if len(cpu):
+        print(f"  CPU busy: avg={cpu.mean(dtype=np.float64):.2f}ms, max={cpu.max():.2f}ms")
+    if len(gpu):
+        print(f"  GPU busy: avg={gpu.mean(dtype=np.float64):.2f}ms, max={gpu.max():.2f}ms")
+    if len(cpu_util):
+        print(f"  CPU util: avg={cpu_util.mean(dtype=np.float64):.1f}%, max={cpu_util.max():.1f}%")
 
+    # Count frames over threshold
+    over_16 = int((ft > 16.67).sum())
+    over_33 = int((ft > 33.33).sum())
+    print(f"  Frames >16.67ms (60fps): {over_16} ({100*over_16/len(ft):.1f}%)")
+    print(f"  Frames >33.33ms (30fps): {over_33} ({100*over_33/len(ft):.1f}%)")
+    print()
+
+summarize("Stutter Period (7-13s)", stutter_frames)
+summarize("Normal Period (50-60s)", normal_frames)
+
+# Look at the exact frames around the worst stutter (10.9s, 331ms)
+print("=== Frames around worst stutter (10.2s-11.5s) ===")
+worst_mask = (col_time >= 10.0) & (col_time <= 11.5) & (col_between_presents > 10)  # Only show significant frames
+for f in select_frames(worst_mask):
+    print(f"  {f['time']:.3f}s: {f['frame_time']:.1f}ms (CPU:{f['cpu_busy']:.1f}ms, GPU:{f['gpu_busy']:.1f}ms)")
+
+# Frame time histogram
+print("\n=== Frame Time Distribution (all frames) ===")
+all_ft = col_between_presents[np.isfinite(col_between_presents)]  # frexp(inf) would land in bucket 0
+
+# Base-2 buckets: bucket k holds frame times in [2**(k-1), 2**k) ms, bucket 0 everything
+# under 1ms. The bucket count is fixed, so histograms of several captures can be added up
+HIST_BUCKETS = 32
+
+def frame_time_histogram(ft):
+    """Counts of finite frame times (ms) per base-2 bucket, as an int64 array of HIST_BUCKETS."""
+    # frexp's exponent e puts x in [2**(e-1), 2**e), i.e. it is the bucket index
+    buckets = np.clip(np.frexp(ft)[1], 0, HIST_BUCKETS - 1)
+    return np.bincount(buckets, minlength=HIST_BUCKETS).astype(np.int64)
+
+def fps(ms):
+    return f"{1000/ms:.0f}" if ms <= 1000 else f"{1000/ms:.2f}"
+
+def bucket_label(k):
+    if k == 0:
+        return '<1ms (1000+ fps)'
+    lo, hi = 2 ** (k - 1), 2 ** k
+    return f"{lo}-{hi}ms ({fps(hi)}-{fps(lo)} fps)"
+
+counts = frame_time_histogram(all_ft)
+total = len(all_ft)
+if total:
+    # Print from the first to the last non-empty bucket
+    used = np.flatnonzero(counts)
+    for k in range(used[0], used[-1] + 1):
+        count = counts[k]
+        bar = '#' * int(50 * count / total)
+        print(f"  {bucket_label(k):25s}: {count:6d} ({100*count/total:5.1f}%) {bar}")
@@ -1,72 +1,58 @@
-import csv
-import statistics
+import numpy as np
+from presentmon import load_presentmon
 
 # Analyze when stutters happen and what correlates with them
-with open(r'C:\Users\Terac\Documents\PresentMon\Captures\wizSS\pmcap-javaw.exe-251207-105743.csv', 'r') as f:
-    reader = csv.reader(f)
-    header = next(reader)
-    
-    idx_time = header.index('TimeInSeconds')
-    idx_between_presents = header.index('MsBetweenPresents')
-    idx_cpu_busy = header.index('MsCPUBusy')
-    idx_gpu_busy = header.index('MsGPUBusy')
-    idx_gpu_util = header.index('GPUUtilization')
-    idx_cpu_util = header.index('CPUUtilization')
-    
-    rows = list(reader)
-    
-    # Find stutter events (>20ms frame time)
-    avg = 3.83
-    stutters = []
-    for i, row in enumerate(rows):
-        try:
-            bp = float(row[idx_between_presents])
-            if bp > 20:  # 20ms = 50fps
-                stutters.append({
-                    'index': i,
-                    'time': float(row[idx_time]),
-                    'frame_time': bp,
-                    'cpu_busy': float(row[idx_cpu_busy]) if row[idx_cpu_busy] else 0,
-                    'gpu_busy': float(row[idx_gpu_busy]) if row[idx_gpu_busy] else 0,
-                    'cpu_util': float(row[idx_cpu_util]) if row[idx_cpu_util] else 0,
-                    'gpu_util': float(row[idx_gpu_util]) if row[idx_gpu_util] else 0
-                })
-        except:
-            pass
-    
-    print(f'=== Stutter Events (>20ms) ===')
-    print(f'Total: {len(stutters)} events')
-    print()
-    
-    # Analyze correlation
-    cpu_limited = [s for s in stutters if s['cpu_busy'] > s['gpu_busy'] * 1.5]
-    gpu_limited = [s for s in stutters if s['gpu_busy'] > s['cpu_busy'] * 1.5]
-    
-    print(f'CPU-limited stutters: {len(cpu_limited)} ({100*len(cpu_limited)/len(stutters):.1f}%)')
-    print(f'GPU-limited stutters: {len(gpu_limited)} ({100*len(gpu_limited)/len(stutters):.1f}%)')
-    
-    print()
-    print('Top 15 worst stutters:')
-    for s in sorted(stutters, key=lambda x: -x['frame_time'])[:15]:
-        bottleneck = 'CPU' if s['cpu_busy'] > s['gpu_busy'] else 'GPU'
-        print(f"  {s['time']:.1f}s: {s['frame_time']:.1f}ms (CPU:{s['cpu_busy']:.1f}ms, GPU:{s['gpu_busy']:.1f}ms) -> {bottleneck} bound")
+CAPTURE = r'C:\Users\Terac\Documents\PresentMon\Captures\wizSS\pmcap-javaw.exe-251207-105743.csv'
+COLUMNS = ['TimeInSeconds', 'MsBetweenPresents', 'MsCPUBusy', 'MsGPUBusy']
 
-    # Check if stutters are clustered
-    print()
-    print('=== Stutter Clustering ===')
-    clusters = []
-    current_cluster = []
-    for s in stutters:
-        if not current_cluster or s['time'] - current_cluster[-1]['time'] < 1.0:
-            current_cluster.append(s)
-        else:
-            if len(current_cluster) > 1:
-                clusters.append(current_cluster)
-            current_cluster = [s]
-    if len(current_cluster) > 1:
-        clusters.append(current_cluster)
-    
-    print(f'Found {len(clusters)} stutter clusters (multiple stutters within 1s)')
-    for i, c in enumerate(clusters[:5]):
-        print(f'  Cluster at ~{c[0]["time"]:.1f}s: {len(c)} stutters')
+table = load_presentmon(CAPTURE, COLUMNS)
+# Time and frame time stay NaN where missing (never counted as a stutter);
+# the other fields read as 0 when missing
+col_time = table.column('TimeInSeconds').to_numpy()
+col_between_presents = table.column('MsBetweenPresents').to_numpy()
+col_cpu_busy = table.column('MsCPUBusy').fill_null(0).to_numpy()
+col_gpu_busy = table.column('MsGPUBusy').fill_null(0).to_numpy()
 
+# Find stutter events (>20ms frame time)
+avg = 3.83
+stutter_mask = (col_between_presents > 20) & ~np.isnan(col_time)  # 20ms = 50fps
+st_time = col_time[stutter_mask]
+st_frame_time = col_between_presents[stutter_mask]
+st_cpu_busy = col_cpu_busy[stutter_mask]
+st_gpu_busy = col_gpu_busy[stutter_mask]
+stutter_count = len(st_time)
+
+print(f'=== Stutter Events (>20ms) ===')
+print(f'Total: {stutter_count} events')
+print()
+
+# Analyze correlation
+cpu_limited = int((st_cpu_busy > st_gpu_busy * 1.5).sum())
+gpu_limited = int((st_gpu_busy > st_cpu_busy * 1.5).sum())
+
+print(f'CPU-limited stutters: {cpu_limited} ({100*cpu_limited/stutter_count:.1f}%)')
+print(f'GPU-limited stutters: {gpu_limited} ({100*gpu_limited/stutter_count:.1f}%)')
+
+print()
+print('Top 15 worst stutters:')
+# Find the 15th longest frame time in linear time, then stable-sort only the frames
+# at or above it, so ties at the cut keep the earliest frames in capture order
+if stutter_count > 15:
+    kth = np.partition(st_frame_time, -15)[-15]
+    candidates = np.flatnonzero(st_frame_time >= kth)
+else:
+    candidates = np.arange(stutter_count)
+for i in candidates[np.argsort(-st_frame_time[candidates], kind='stable')][:15]:
+    bottleneck = 'CPU' if st_cpu_busy[i] > st_gpu_busy[i] else 'GPU'
+    print(f"  {st_time[i]:.1f}s: {st_frame_time[i]:.1f}ms (CPU:{st_cpu_busy[i]:.1f}ms, GPU:{st_gpu_busy[i]:.1f}ms) -> {bottleneck} bound")
+
+# Check if stutters are clustered
+print()
+print('=== Stutter Clustering ===')
+# A new cluster starts wherever the gap to the previous stutter is 1s or more
+boundaries = np.flatnonzero(np.diff(st_time) >= 1.0) + 1
+clusters = [c for c in np.split(st_time, boundaries) if len(c) > 1]
+
+print(f'Found {len(clusters)} stutter clusters (multiple stutters within 1s)')
+for i, c in enumerate(clusters[:5]):
+    print(f'  Cluster at ~{c[0]:.1f}s: {len(c)} stutters')
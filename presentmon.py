@@ -0,0 +1,87 @@
+import os
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# Loading PresentMon captures for the analysis scripts
+
+# Parse in 4MB blocks across all cores
+READ_OPTIONS = pacsv.ReadOptions(use_threads=True, block_size=4 << 20)
+PARSE_OPTIONS = pacsv.ParseOptions(newlines_in_values=False)
+
+# The numeric columns the analysis reads are typed up front rather than inferred:
+# timestamps as float64 (seconds into a long capture need the digits), the
+# millisecond timings and counters as float32, which halves their footprint.
+# Empty cells and PresentMon's 'NA' become null
+COLUMN_TYPES = {name: pa.float32() for name in (
+    'MsBetweenPresents', 'MsCPUBusy', 'MsGPUBusy',
+    'CPUUtilization', 'CPUFrequency', 'GPUUtilization', 'GPUFrequency')}
+COLUMN_TYPES['TimeInSeconds'] = pa.float64()
+CONVERT_OPTIONS = pacsv.ConvertOptions(column_types=COLUMN_TYPES)
+
+def load_presentmon(path, columns):
+    """Columns of a PresentMon capture CSV as an Arrow table.
+
+    The whole capture is parsed once and kept next to it as an Arrow IPC file
+    (path + '.arrow'), rebuilt when the CSV is newer. Later loads, from either
+    script, memory-map that file: there is no parsing, and because the file
+    already holds the COLUMN_TYPES types, the returned columns are views into
+    the mapping. Converting them with to_numpy() still copies a column that
+    has nulls or spans several record batches.
+    """
+    cache = path + '.arrow'
+    if not _cache_is_current(path, cache):
+        try:
+            _stream_cache(path, cache)
+        except (OSError, pa.ArrowInvalid):
+            # Read-only location, or a later block didn't fit the type guessed from the
+            # first one for a column outside COLUMN_TYPES: parse the whole file at once
+            # so every column is typed from all of it, and cache that if possible
+            with pa.memory_map(path, 'r') as source:
+                table = pacsv.read_csv(source, read_options=READ_OPTIONS, parse_options=PARSE_OPTIONS,
+                                       convert_options=CONVERT_OPTIONS)
+            try:
+                _write_cache(cache, table.schema, table.to_batches())
+            except OSError:
+                pass  # Read-only location: just use the parsed table
+            return table.select(columns)
+    # Uncompressed IPC, so the buffers are read in place from the mapped file
+    return pa.ipc.open_file(pa.memory_map(cache, 'r')).read_all().select(columns)
+
+def _cache_is_current(path, cache):
+    """Whether the IPC cache exists, is newer than the capture and holds the COLUMN_TYPES types."""
+    if not os.path.exists(cache) or os.path.getmtime(cache) < os.path.getmtime(path):
+        return False
+    try:
+        with pa.OSFile(cache) as source:
+            schema = pa.ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return False
+    # A cache written with other column types (e.g. by an older version) is rebuilt
+    return all(schema.field(name).type == type_ for name, type_ in COLUMN_TYPES.items()
+               if name in schema.names)
+
+def _stream_cache(path, cache):
+    """Stream the capture into the IPC cache one block at a time.
+
+    Memory use stays around the block size rather than the file size.
+    """
+    with pa.memory_map(path, 'r') as source:
+        reader = pacsv.open_csv(source, read_options=READ_OPTIONS, parse_options=PARSE_OPTIONS,
+                                convert_options=CONVERT_OPTIONS)
+        _write_cache(cache, reader.schema, reader)
+
+def _write_cache(cache, schema, batches):
+    """Write record batches as the IPC cache.
+
+    The file is written beside the cache and then swapped in, so an interrupted
+    run never leaves a torn cache.
+    """
+    try:
+        with pa.OSFile(cache + '.tmp', 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+        os.replace(cache + '.tmp', cache)
+    except BaseException:
+        if os.path.exists(cache + '.tmp'):
+            os.remove(cache + '.tmp')
+        raise